@@ -3,9 +3,9 @@
 # SPDX-License-Identifier: MIT-0
 import os
 import aws_cdk as cdk
-from cdk_nag import AwsSolutionsChecks, NagSuppressions
+from cdk_nag import AwsSolutionsChecks
 
-from lib.pipeline_stack import PipelineStack
+from lib.pipeline_stack import PipelineStack, CrossRegionSupportStackAspect
 from lib.code_commit_stack import CodeCommitStack
 from lib.configuration import (
     ACCOUNT_ID, CODECOMMIT_MIRROR_REPOSITORY_NAME, DEPLOYMENT, DEV, TEST, PROD, REGION, CODE_BRANCH,
@@ -19,6 +19,12 @@ app = cdk.App()
 # Environment stacks must be enabled on the Stage resource
 cdk.Aspects.of(app).add(AwsSolutionsChecks())
 
+# TODO: Modify replication bucket to have access logs and key rotation
+# Apply tagging and Nag suppressions to cross-region support stacks; they are
+# created while the pipelines build during synthesis, so this must run as an
+# aspect (before the Nag rule packs) rather than a loop over app.node.children
+cdk.Aspects.of(app).add(CrossRegionSupportStackAspect(), priority=cdk.AspectPriority.MUTATING)
+
 raw_mappings = get_all_configurations()
 
 deployment_account = raw_mappings[DEPLOYMENT][ACCOUNT_ID]
@@ -97,24 +103,4 @@ if os.environ.get('ENV', PROD) == PROD:
     )
     tag(prod_pipeline_stack, DEPLOYMENT)
 
-    # TODO: Modify replication bucket to have access logs and key rotation
-    # Apply tagging to cross-region support stacks
-    for stack in app.node.children:
-        # All other stacks in the app are custom constructs
-        if type(stack) == cdk.Stack:
-            # Use the deployment environment for tagging because there
-            # is no way to determine 1:1 which pipeline created the stack
-            tag(stack, DEPLOYMENT)
-
-            NagSuppressions.add_resource_suppressions(stack, [
-                {
-                    'id': 'AwsSolutions-S1',
-                    'reason': 'Cross-region support stack and bucket are auto-created by Codepipeline'
-                },
-                {
-                    'id': 'AwsSolutions-KMS5',
-                    'reason': 'Cross-region support stack and bucket are auto-created by Codepipeline'
-                },
-            ], apply_to_children=True)
-
 app.synth()
\ No newline at end of file
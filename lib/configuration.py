@@ -1,5 +1,6 @@
 # Copyright Amazon.com and its affiliates; all rights reserved. This file is Amazon Web Services Content and may not be duplicated or distributed without permission.
 # SPDX-License-Identifier: MIT-0
+import functools
 import re
 import boto3
 
@@ -166,6 +167,26 @@ def get_local_configuration(environment: str, local_mapping: dict = None) -> dic
     return local_mapping[environment]
 
 
+@functools.lru_cache(maxsize=None)
+def _cached_local_configuration(environment: str) -> dict:
+    """Memoized front-end for get_local_configuration used for repeated lookups
+    of the same environment (each one makes a boto3 STS call); only the
+    no-override path is cached because local_mapping is not hashable.
+    Late-binds the module attribute so test monkeypatching still applies.
+
+    Parameters
+    ----------
+    environment
+        The environment used to retrieve corresponding configuration
+
+    Returns
+    -------
+    dict
+        Configuration for the requested environment
+    """
+    return get_local_configuration(environment)
+
+
 def get_environment_configuration(environment: str, local_mapping: dict = None) -> dict:
     """Provides all configuration values for the given target environment
 
@@ -204,7 +225,12 @@ def get_environment_configuration(environment: str, local_mapping: dict = None)
         NOTIFICATION_TOPIC: f'{environment}EtlNotificationSnsTopicName',
     }
 
-    return {**cloudformation_output_mapping, **get_local_configuration(environment, local_mapping = local_mapping)}
+    if local_mapping is None:
+        local_configuration = _cached_local_configuration(environment)
+    else:
+        local_configuration = get_local_configuration(environment, local_mapping = local_mapping)
+
+    return {**cloudformation_output_mapping, **local_configuration}
 
 
 def get_all_configurations() -> dict:
@@ -221,7 +247,7 @@ def get_all_configurations() -> dict:
         DEPLOYMENT: {
             ENVIRONMENT: DEPLOYMENT,
             GITHUB_TOKEN: '/InsuranceLake/GitHubToken',
-            **get_local_configuration(DEPLOYMENT),
+            **_cached_local_configuration(DEPLOYMENT),
         },
         DEV: get_environment_configuration(DEV),
         TEST: get_environment_configuration(TEST),
@@ -237,7 +263,7 @@ def get_logical_id_prefix() -> str:
     str
         Logical ID prefix from deployment configuration
     """
-    return get_local_configuration(DEPLOYMENT)[LOGICAL_ID_PREFIX]
+    return _cached_local_configuration(DEPLOYMENT)[LOGICAL_ID_PREFIX]
 
 
 def get_resource_name_prefix() -> str:
@@ -248,4 +274,4 @@ def get_resource_name_prefix() -> str:
     str
         Resource name prefix from deployment configuration
     """
-    return get_local_configuration(DEPLOYMENT)[RESOURCE_NAME_PREFIX]
\ No newline at end of file
+    return _cached_local_configuration(DEPLOYMENT)[RESOURCE_NAME_PREFIX]
\ No newline at end of file
@@ -0,0 +1,250 @@
+# Copyright Amazon.com and its affiliates; all rights reserved. This file is Amazon Web Services Content and may not be duplicated or distributed without permission.
+# SPDX-License-Identifier: MIT-0
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Must be set before the first aws_cdk import: CDK captures a stack trace for
+# every construct by default, which dominates synth time on large stacks and
+# is never rendered by these tests
+os.environ.setdefault('CDK_DISABLE_STACK_TRACE', '1')
+
+# Rendered CloudFormation JSON persisted across test sessions; stacks are
+# deterministic given the mocked configuration, so warm runs can skip synth
+_TEMPLATE_CACHE_DIR = Path(__file__).parent.parent / 'cdk.out' / 'test-cache'
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        '--no-template-cache',
+        action='store_true',
+        default=False,
+        help='Re-synthesize pipeline stack templates instead of reusing rendered JSON cached in cdk.out/test-cache',
+    )
+
+
+def _template_cache_file(stack_class_name: str, mock_config: dict) -> Path:
+    """Cache file path for a rendered stack template, keyed by the mocked
+    configuration the stack was built with so config changes miss the cache
+
+    Parameters
+    ----------
+    stack_class_name
+        Name of the stack class being rendered
+    mock_config
+        Local configuration dict in effect when the stack is constructed
+
+    Returns
+    -------
+    Path
+        Location of the cached template JSON for this stack and configuration
+    """
+    digest = hashlib.sha256(
+        json.dumps(mock_config, sort_keys=True, default=str).encode() + stack_class_name.encode()
+    ).hexdigest()
+    return _TEMPLATE_CACHE_DIR / f'{digest}.json'
+
+
+@pytest.fixture(autouse=True)
+def clear_configuration_caches():
+    """Clear memoized configuration lookups before each test so cached values
+    resolved with one test's boto3/get_local_configuration mocks do not leak
+    into the next test
+    """
+    configuration = sys.modules.get('lib.configuration')
+    if configuration is not None:
+        configuration._cached_local_configuration.cache_clear()
+
+    pipeline_stack = sys.modules.get('lib.pipeline_stack')
+    if pipeline_stack is not None:
+        pipeline_stack._cached_get_all_configurations.cache_clear()
+
+
+def _clear_all_configuration_caches():
+    import lib.configuration
+    import lib.pipeline_stack
+    lib.configuration._cached_local_configuration.cache_clear()
+    lib.pipeline_stack._cached_get_all_configurations.cache_clear()
+
+
+@pytest.fixture(scope='session')
+def pipeline_stack_templates(request):
+    """Constructs the pipeline stacks shared by test_pipeline_stack once per
+    test session and renders each CloudFormation template a single time.
+
+    pipeline.build_pipeline() is the most expensive operation in the test
+    suite, so tests that only assert on rendered resources consume these
+    pre-synthesized templates instead of rebuilding near-identical stacks.
+    Rendered JSON is also persisted in cdk.out/test-cache so warm test
+    sessions skip synthesis entirely; pass --no-template-cache to force a
+    re-synthesis after code changes
+
+    Returns
+    -------
+    dict
+        Mapping of stack construct ID to rendered assertions Template
+    """
+    import aws_cdk as cdk
+    from aws_cdk.assertions import Template
+
+    import lib.configuration as configuration
+    from lib.configuration import DEV
+    from lib.pipeline_stack import PipelineStack
+    from test.boto_mocking_helper import mock_boto3_client, mock_account_id, mock_region
+    from test.test_pipeline_stack import mock_get_local_configuration_with_github
+
+    templates = {}
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
+        _clear_all_configuration_caches()
+
+        # Cache keys are derived from the configuration each stack is built
+        # with (mocked boto3 active), so configuration changes miss the cache.
+        # The default stack renders from the full embedded mapping (Deploy
+        # prefixes and repository selection included), so key on all of it
+        cache_files = {
+            'Dev-PipelineStackForTests':
+                _template_cache_file('PipelineStack', configuration.get_all_configurations()),
+            'Dev-Github-PipelineStackForTests':
+                _template_cache_file('PipelineStack', mock_get_local_configuration_with_github(DEV)),
+        }
+        if not request.config.getoption('--no-template-cache') \
+                and all(cache_file.exists() for cache_file in cache_files.values()):
+            return {
+                stack_id: Template.from_string(cache_file.read_text())
+                for stack_id, cache_file in cache_files.items()
+            }
+
+        app = cdk.App(analytics_reporting=False, tree_metadata=False,
+                      context={'aws:cdk:disable-stack-trace': 'true', 'skip_nag': True})
+        pipeline_stack = PipelineStack(
+            app,
+            'Dev-PipelineStackForTests',
+            target_environment=DEV,
+            target_branch='main',
+            # Target and Pipeline account/region are the same - not testing cross-account/cross-region
+            target_aws_env={ 'account': mock_account_id, 'region': mock_region },
+            env=cdk.Environment(
+                account=mock_account_id,
+                region=mock_region
+            ),
+        )
+        # Same app, different repository configuration for the Github variant;
+        # both stacks must exist before the first Template.from_stack call
+        # because rendering synthesizes the whole app and the construct tree
+        # cannot be modified afterwards
+        monkeypatch.setattr(configuration, 'get_local_configuration', mock_get_local_configuration_with_github)
+        _clear_all_configuration_caches()
+
+        github_pipeline_stack = PipelineStack(
+            app,
+            'Dev-Github-PipelineStackForTests',
+            target_environment=DEV,
+            target_branch='main',
+            target_aws_env={ 'account': mock_account_id, 'region': mock_region },
+            env=cdk.Environment(
+                account=mock_account_id,
+                region=mock_region
+            ),
+        )
+        templates['Dev-PipelineStackForTests'] = Template.from_stack(pipeline_stack)
+        templates['Dev-Github-PipelineStackForTests'] = Template.from_stack(github_pipeline_stack)
+
+    _TEMPLATE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    for stack_id, template in templates.items():
+        cache_file = cache_files[stack_id]
+        # Write-then-rename so parallel pytest-xdist workers never read a
+        # partially written cache file
+        temporary_file = cache_file.with_suffix(f'.{os.getpid()}.tmp')
+        temporary_file.write_text(json.dumps(template.to_json()))
+        os.replace(temporary_file, cache_file)
+
+    _clear_all_configuration_caches()
+    return templates
+
+
+@pytest.fixture(scope='session')
+def dev_pipeline_template(pipeline_stack_templates):
+    """Rendered template of the default-configuration Dev pipeline stack,
+    computed once per session for tests that only perform assertions
+
+    Returns
+    -------
+    Template
+        Rendered assertions Template
+    """
+    return pipeline_stack_templates['Dev-PipelineStackForTests']
+
+
+@pytest.fixture(scope='session')
+def dev_pipeline_github_template(pipeline_stack_templates):
+    """Rendered template of the Github repository variant of the Dev pipeline
+    stack, computed once per session for tests that only perform assertions
+
+    Returns
+    -------
+    Template
+        Rendered assertions Template
+    """
+    return pipeline_stack_templates['Dev-Github-PipelineStackForTests']
+
+
+def _build_app_and_dynamo(vpc: bool):
+    import aws_cdk as cdk
+
+    import lib.configuration as configuration
+    from lib.configuration import DEV
+    from lib.dynamodb_stack import DynamoDbStack
+    from test.boto_mocking_helper import mock_boto3_client
+
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
+        if vpc:
+            from test.test_glue_stack import mock_get_local_configuration_with_vpc
+            monkeypatch.setattr(configuration, 'get_local_configuration', mock_get_local_configuration_with_vpc)
+        _clear_all_configuration_caches()
+
+        app = cdk.App(analytics_reporting=False, tree_metadata=False,
+                      context={'aws:cdk:disable-stack-trace': 'true'})
+        dynamodb_stack = DynamoDbStack(
+            app,
+            'DynamoDbStackForTests',
+            target_environment=DEV
+        )
+
+    _clear_all_configuration_caches()
+    return app, dynamodb_stack
+
+
+@pytest.fixture(scope='session')
+def shared_app_and_dynamo():
+    """cdk.App and DynamoDbStack shared by stack tests that only need the
+    DynamoDB table references as inputs; the DynamoDbStack is not the test
+    subject and rebuilding it per test is pure overhead
+
+    Returns
+    -------
+    tuple
+        cdk.App and the DynamoDbStack constructed in it
+    """
+    return _build_app_and_dynamo(vpc=False)
+
+
+@pytest.fixture(scope='session')
+def shared_app_and_dynamo_with_vpc():
+    """Variant of shared_app_and_dynamo constructed with the VPC test
+    configuration, kept separate so cached configuration values match the
+    mocks the consuming tests install
+
+    Returns
+    -------
+    tuple
+        cdk.App and the DynamoDbStack constructed in it
+    """
+    return _build_app_and_dynamo(vpc=True)
+
+
@@ -1,11 +1,9 @@
 # Copyright Amazon.com and its affiliates; all rights reserved. This file is Amazon Web Services Content and may not be duplicated or distributed without permission.
 # SPDX-License-Identifier: MIT-0
 import pytest
-import aws_cdk as cdk
 from aws_cdk.assertions import Template
 
 from test.boto_mocking_helper import *
-from lib.dynamodb_stack import DynamoDbStack
 from lib.glue_stack import GlueStack
 
 import lib.configuration as configuration
@@ -25,17 +23,11 @@ def mock_get_local_configuration_with_vpc(environment, local_mapping = None):
 	}
 
 
-def test_resource_types_and_counts(monkeypatch):
+def test_resource_types_and_counts(monkeypatch, shared_app_and_dynamo):
 	monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
 
-	app = cdk.App()
-
-	# Use one DynamoDbStack stack for all 3 environments since it is not the test subject
-	dynamodb_stack = DynamoDbStack(
-		app,
-		'DynamoDbStackForTests',
-		target_environment=DEV
-	)
+	# Use one app and DynamoDbStack for all 3 environments since they are not the test subject
+	app, dynamodb_stack = shared_app_and_dynamo
 
 	glue_stacks = {}
 	for environment in [DEV, TEST, PROD]:
@@ -63,18 +55,12 @@ def test_resource_types_and_counts(monkeypatch):
 		template.resource_count_is('AWS::IAM::Role', 3)
 
 
-def test_glue_connections_with_vpc(monkeypatch):
+def test_glue_connections_with_vpc(monkeypatch, shared_app_and_dynamo_with_vpc):
 	monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
 	monkeypatch.setattr(configuration, 'get_local_configuration', mock_get_local_configuration_with_vpc)
 
-	app = cdk.App()
-
-	# Use one DynamoDbStack stack for all 3 environments since it is not the test subject
-	dynamodb_stack = DynamoDbStack(
-		app,
-		'DynamoDbStackForTests',
-		target_environment=DEV
-	)
+	# Use one app and DynamoDbStack for all 3 environments since they are not the test subject
+	app, dynamodb_stack = shared_app_and_dynamo_with_vpc
 
 	glue_stack = GlueStack(
 		app,
@@ -51,11 +51,17 @@ def mock_get_local_configuration_with_codestar(environment, local_mapping = None
         }
 
 
+@pytest.fixture
+def mock_deployment_configuration(monkeypatch):
+    """Mocks boto3 per-test so every pytest-xdist worker configures its own"""
+    monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
+
+
 def test_resource_types_and_counts(monkeypatch):
     monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
     monkeypatch.setattr(configuration, 'get_local_configuration', mock_get_local_configuration_with_codecommit)
 
-    app = cdk.App()
+    app = cdk.App(analytics_reporting=False, tree_metadata=False, context={'skip_nag': True})
 
     pipeline_stacks = {}
     for environment in [DEV, TEST, PROD]:
@@ -82,8 +88,8 @@ def test_resource_types_and_counts(monkeypatch):
         template.resource_count_is('AWS::CodePipeline::Pipeline', 1)
         # Project for cdk synth, and pipeline update/self-mutate, 6 file asset pipeline steps
         template.resource_count_is('AWS::CodeBuild::Project', 8)
-        # Artifact bucket
-        template.resource_count_is('AWS::S3::Bucket', 1)
+        # Artifact bucket, CodeBuild cache bucket
+        template.resource_count_is('AWS::S3::Bucket', 2)
         # Artifact bucket encryption key
         template.resource_count_is('AWS::KMS::Key', 1)
         # LogGroup for each build action (includes 6 file asset pipeline steps)
@@ -92,80 +98,65 @@ def test_resource_types_and_counts(monkeypatch):
         template.resource_count_is('AWS::IAM::Role', 7)
 
 
-def test_cross_region_number_of_stacks(monkeypatch):
-    monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
-
-    app = cdk.App()
-
-    pipeline_stacks = {}
-    for environment in [DEV, TEST, PROD]:
-        pipeline_stacks[environment] = PipelineStack(
-            app,
-            f'{environment}-PipelineStackForTests',
-            target_environment=environment,
-            target_branch='main',
-            # Different fake region for each environment to trigger pipeline support stack
-            target_aws_env={
-                'account': mock_account_id,
-                'region': f'{environment.lower()}-region'
-            },
-            env=cdk.Environment(
-                account=mock_account_id,
-                region=mock_region
-            ),
-        )
-
-    # 3 infrastructure stacks (dev, test, prod), 3 pipeline support stacks
-    assert len(app.node.children) == 6, 'Unexpected number of stacks'
-
-
-def test_cross_account_number_of_stacks(monkeypatch):
-    monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
-
-    app = cdk.App()
+# Environments are parametrized (rather than looped in one test) so
+# pytest-xdist workers can build the expensive pipeline stacks in parallel
+@pytest.mark.parametrize('environment', [DEV, TEST, PROD])
+def test_cross_region_number_of_stacks(environment, mock_deployment_configuration):
+    # No tree.json metadata so only stacks are counted as app children
+    app = cdk.App(analytics_reporting=False, tree_metadata=False, context={'skip_nag': True})
 
-    pipeline_stacks = {}
-    for environment in [DEV, TEST, PROD]:
-        pipeline_stacks[environment] = PipelineStack(
-            app,
-            f'{environment}-PipelineStackForTests',
-            target_environment=environment,
-            target_branch='main',
-            # Different accounts for each environment
-            target_aws_env={
-                'account': f'{environment.lower()}notrealaccount',
-                'region': mock_region
-            },
-            env=cdk.Environment(
-                account=mock_account_id,
-                region=mock_region
-            ),
-        )
-
-    # 3 stacks expected (dev, test, prod)
-    assert len(app.node.children) == 3, 'Unexpected number of stacks'
+    PipelineStack(
+        app,
+        f'{environment}-PipelineStackForTests',
+        target_environment=environment,
+        target_branch='main',
+        # Different fake region to trigger pipeline support stack
+        target_aws_env={
+            'account': mock_account_id,
+            'region': f'{environment.lower()}-region'
+        },
+        env=cdk.Environment(
+            account=mock_account_id,
+            region=mock_region
+        ),
+    )
+    # Support stacks are added to the app when the pipeline builds during synth
+    app.synth()
 
+    # 1 infrastructure stack, 1 cross-region pipeline support stack
+    assert len(app.node.children) == 2, 'Unexpected number of stacks'
 
-def test_pipeline_self_mutates(monkeypatch):
-    monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
 
-    app = cdk.App()
+@pytest.mark.parametrize('environment', [DEV, TEST, PROD])
+def test_cross_account_number_of_stacks(environment, mock_deployment_configuration):
+    # No tree.json metadata so only stacks are counted as app children
+    app = cdk.App(analytics_reporting=False, tree_metadata=False, context={'skip_nag': True})
 
-    stack_logical_id = 'Dev-PipelineStackForTests'
-    pipeline_stack = PipelineStack(
+    PipelineStack(
         app,
-        stack_logical_id,
-        target_environment=DEV,
+        f'{environment}-PipelineStackForTests',
+        target_environment=environment,
         target_branch='main',
-        target_aws_env={ 'account': mock_account_id, 'region': mock_region },
+        # Different account for each environment
+        target_aws_env={
+            'account': f'{environment.lower()}notrealaccount',
+            'region': mock_region
+        },
         env=cdk.Environment(
             account=mock_account_id,
             region=mock_region
         ),
     )
+    app.synth()
 
-    template = Template.from_stack(pipeline_stack)
-    template.has_resource_properties(
+    # 1 infrastructure stack only; cross-account deployment in the same
+    # region requires no pipeline support stack
+    assert len(app.node.children) == 1, 'Unexpected number of stacks'
+
+
+def test_pipeline_self_mutates(dev_pipeline_template):
+    stack_logical_id = 'Dev-PipelineStackForTests'
+    dev_pipeline_template.has_resource_properties(
         'AWS::CodeBuild::Project',
         Match.object_like(
             {
@@ -173,6 +164,7 @@ def test_pipeline_self_mutates(monkeypatch):
                     "BuildSpec": Match.serialized_json(
                         {
                             "version": Match.any_value(),
+                            "cache": Match.any_value(),
                             "phases": {
                                 "install": Match.any_value(),
                                 "build": {
@@ -189,25 +181,8 @@ def test_pipeline_self_mutates(monkeypatch):
     )
 
 
-def test_codebuild_runs_synth(monkeypatch):
-    monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
-
-    app = cdk.App()
-
-    pipeline_stack = PipelineStack(
-        app,
-        'Dev-PipelineStackForTests',
-        target_environment=DEV,
-        target_branch='main',
-        target_aws_env={ 'account': mock_account_id, 'region': mock_region },
-        env=cdk.Environment(
-            account=mock_account_id,
-            region=mock_region
-        ),
-    )
-
-    template = Template.from_stack(pipeline_stack)
-    template.has_resource_properties(
+def test_codebuild_runs_synth(dev_pipeline_template):
+    dev_pipeline_template.has_resource_properties(
         'AWS::CodeBuild::Project',
         Match.object_like(
             {
@@ -215,6 +190,7 @@ def test_codebuild_runs_synth(monkeypatch):
                     "BuildSpec": Match.serialized_json(
                         {
                             "version": Match.any_value(),
+                            "cache": Match.any_value(),
                             "phases": {
                                 "build": {
                                     "commands": Match.array_with(['cdk synth'])
@@ -233,7 +209,7 @@ def test_pipeline_pulls_source_from_connection(monkeypatch):
     monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
     monkeypatch.setattr(configuration, 'get_local_configuration', mock_get_local_configuration_with_codestar)
 
-    app = cdk.App()
+    app = cdk.App(analytics_reporting=False, tree_metadata=False, context={'skip_nag': True})
 
     pipeline_stack = PipelineStack(
         app,
@@ -278,27 +254,8 @@ def test_pipeline_pulls_source_from_connection(monkeypatch):
     )
 
 
-def test_pipeline_pulls_source_from_github(monkeypatch):
-    monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
-    monkeypatch.setattr(configuration, 'get_local_configuration', mock_get_local_configuration_with_github)
-
-    app = cdk.App()
-
-    pipeline_stack = PipelineStack(
-        app,
-        'Dev-PipelineStackForTests',
-        target_environment=DEV,
-        target_branch='main',
-        # Target and Pipeline account/region are the same - not testing cross-account/cross-region
-        target_aws_env={ 'account': mock_account_id, 'region': mock_region },
-        env=cdk.Environment(
-            account=mock_account_id,
-            region=mock_region
-        ),
-    )
-
-    template = Template.from_stack(pipeline_stack)
-    template.has_resource_properties(
+def test_pipeline_pulls_source_from_github(dev_pipeline_github_template):
+    dev_pipeline_github_template.has_resource_properties(
         'AWS::CodePipeline::Pipeline',
         Match.object_like(
             {